@@ -14,6 +14,7 @@ __all__ = [
     "memory",
     "router_table",
     "prims",
+    "config",
     "core",
     "simulator",
 ]
@@ -0,0 +1,126 @@
+"""
+Config loading: turns the JSON array/core configs into CoreConfig / PrimOp objects.
+"""
+
+from __future__ import annotations
+
+import json
+import warnings
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .prims import SendPrim, RecvPrim, STOP_SINGLETON, CoreConfig, PrimOp, PrimKind
+
+try:  # optional: faster C JSON parser, same dict/list output
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+def _plus_one(v) -> int:
+    # JSON numbers arrive as int already; anything else must convert cleanly or the config is rejected
+    return v + 1 if type(v) is int else int(v) + 1
+
+
+def _normalize_send_entry(send_obj: dict, clamp_cnt: bool = False) -> SendPrim:
+    # Config stores message_num / cnt as N-1; SendPrim and the packet encoder expect N
+    s = dict(send_obj)
+    msgs = s.get("messages")
+    if isinstance(msgs, list):
+        new_msgs = []
+        for m in msgs:
+            if isinstance(m, dict):
+                m2 = dict(m)
+                if  ("cnt" in m2):
+                    m2["cnt"] = max(1, _plus_one(m2["cnt"])) if clamp_cnt else _plus_one(m2["cnt"])
+                new_msgs.append(m2)
+        s["messages"] = new_msgs
+        s["message_num"] = len(new_msgs)
+    elif ("message_num" in s):
+        s["message_num"] = _plus_one(s["message_num"])
+    return SendPrim(**s)
+
+
+def _normalize_recv_entry(recv_obj: dict) -> RecvPrim:
+    r = dict(recv_obj)
+    r["use_end_num"] = ("end_num" in r)
+    return RecvPrim(**r)
+
+
+def _load_stop(it: dict, mem_addr: Optional[int]) -> PrimOp:
+    return PrimOp(kind=PrimKind.STOP, stop=STOP_SINGLETON, mem_addr=mem_addr)
+
+
+def _load_send_recv(it: dict, mem_addr: Optional[int]) -> PrimOp:
+    # Combined support: allow both 'send' and 'recv' fields in one entry
+    send_obj = it.get("send")
+    recv_obj = it.get("recv")
+    send = _normalize_send_entry(send_obj) if isinstance(send_obj, dict) else None
+    recv = _normalize_recv_entry(recv_obj) if isinstance(recv_obj, dict) else None
+    if send is None and recv is None:
+        raise ValueError("prim_queue entry must specify 'send', 'recv', or 'stop'")
+    entry_kind = PrimKind.SEND if send is not None else PrimKind.RECV
+    return PrimOp(kind=entry_kind, send=send, recv=recv, mem_addr=mem_addr)
+
+
+# prim_queue entry "kind" -> loader; entries without a known kind are read from their send/recv fields
+_KIND_HANDLERS = {"stop": _load_stop, "send": _load_send_recv, "recv": _load_send_recv}
+
+
+def load_core_config(obj: dict, warn_deprecated: bool = False) -> CoreConfig:
+
+    # Preferred unified queue
+    if "prim_queue" in obj:
+        # STOP primitive (by kind or explicit boolean field); otherwise send and/or recv fields.
+        # Built straight into a tuple: the queue is read-only once loaded (no list over-allocation).
+        q = tuple(
+            (_load_stop if it.get("stop") is True else _KIND_HANDLERS.get(it.get("kind"), _load_send_recv))(it, it.get("mem_addr"))
+            for it in obj["prim_queue"]
+        )
+        return CoreConfig(init_mem_path=obj.get("init_mem_path"), prim_queue=q)
+
+    if ("send_queue" in obj or "recv_queue" in obj):
+        if "prim_queue" in obj:
+            warnings.warn(
+                "DEPRECATED: Detected send_queue/recv_queue; they are ignored when prim_queue is present. "
+                "Please migrate fully to prim_queue and remove legacy fields.",
+                UserWarning,
+            )
+        else:
+            warnings.warn(
+                "DEPRECATED: Using legacy send_queue/recv_queue; auto-converting to prim_queue. "
+                "This path will be removed in the future. Please migrate to prim_queue.",
+                UserWarning,
+            )
+
+    sends = [_normalize_send_entry(s_in, clamp_cnt=True) for s_in in obj.get("send_queue", []) if isinstance(s_in, dict)]
+    recvs = [RecvPrim(**r) for r in obj.get("recv_queue", [])]
+    q = tuple([PrimOp(kind=PrimKind.SEND, send=s) for s in sends] + [PrimOp(kind=PrimKind.RECV, recv=r) for r in recvs])
+    return CoreConfig(init_mem_path=obj.get("init_mem_path"), prim_queue=q)
+
+
+@lru_cache(maxsize=8)
+def _read_config_json(path: str, mtime_ns: int) -> dict:
+    # Keyed by (path, mtime) so an edited config is re-read. Only the parsed JSON is shared:
+    # load_core_config copies every entry it normalizes and never mutates its input
+    return _json_loads(Path(path).read_bytes())
+
+
+def load_array_config(path: str) -> Tuple[int, int, Tuple[Optional[CoreConfig], ...]]:
+    """
+    Parse an array config JSON into (height, width, cores); the JSON parse is cached per file,
+    the returned CoreConfigs are fresh on every call.
+    cores is dense row-major (index y * width + x); None marks a core without config.
+    """
+    p = Path(path).resolve()
+    cfg_json = _read_config_json(str(p), p.stat().st_mtime_ns)
+    h = int(cfg_json["height"]) ; w = int(cfg_json["width"]) ;
+    cores_cfg: List[Optional[CoreConfig]] = [None] * (h * w)
+    for ent in cfg_json.get("cores", []):
+        y, x = int(ent["y"]), int(ent["x"]) ;
+        # cores outside the grid are never simulated (and must not alias an in-grid y * w + x slot)
+        if 0 <= y < h and 0 <= x < w:
+            cores_cfg[y * w + x] = load_core_config(ent["config"])
+    return h, w, tuple(cores_cfg)
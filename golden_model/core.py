@@ -1,11 +1,27 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Sequence, Union
 
-from .memory import CoreMemory, iter_cells_span_from_A_8B, iter_cells_span_from_A_1B
-from .prims import SendPrim, RecvPrim, CoreConfig, PrimOp, encode_prim_cell, decode_prim_cell
-from .router_table import parse_router_table_from_memory, RouterTableEntry, encode_packet_from_fields, write_router_table_to_memory
+from .memory import CoreMemory, MEM_CELL_BYTES, iter_cells_span_from_A_8B, iter_cells_span_from_A_1B
+from .prims import SendPrim, RecvPrim, CoreConfig, PrimOp, PrimKind, encode_prim_cell, decode_prim_cell
+from .router_table import RouterTable, encode_packet_from_fields, write_router_table_to_memory
+
+
+@dataclass
+class PendingTag:
+    """
+    Messages buffered at a destination for one tag: payloads are appended
+    back-to-back into a single buffer, with per-message metadata alongside.
+    """
+
+    data: bytearray
+    # (is_cell_mode, a0, a_offset, group_size, payload length): only the RTE fields replay needs
+    msgs: List[Tuple[bool, int, int, int, int]]
+
+    def append(self, is_cell_mode: bool, a0: int, a_offset: int, group_size: int, payload: bytes) -> None:
+        self.data += payload
+        self.msgs.append((is_cell_mode, a0, a_offset, group_size, len(payload)))
 
 
 @dataclass
@@ -19,18 +35,27 @@ class CoreNode:
     mem: CoreMemory
     prim_queue: List[PrimOp]
     # runtime buffer for unmatched sends (by tag)
-    pending_by_tag: Dict[int, List[Tuple[bool, dict, bytes]]]  # (is_cell_mode, rte_fields, payload)
+    pending_by_tag: Dict[int, PendingTag]
     # runtime counters of delivered messages per tag
     delivered_count_by_tag: Dict[int, int] = None
     # when a Recv with use_end_num is first encountered, remember baseline delivered count
     recv_baseline_by_idx: Dict[int, Tuple[int, int]] = None  # prim_index -> (tag, baseline)
     # progress of Send primitive per prim index: next message index to send
     send_progress_by_idx: Dict[int, int] = None
+    # recv_addr of the first Recv prim per tag (built once prim_queue is final)
+    recv_base_by_tag: Dict[int, int] = None
 
     def load_init_if_any(self, init_path: str | None) -> None:
         if init_path:
             self.mem.load_from_inputs_file(init_path)
 
+    def index_recv_bases(self) -> None:
+        # if multiple recv prims share a tag, the first one wins
+        self.recv_base_by_tag = {}
+        for op in self.prim_queue:
+            if op.recv is not None and op.recv.tag_id not in self.recv_base_by_tag:
+                self.recv_base_by_tag[op.recv.tag_id] = op.recv.recv_addr
+
 
 class NoCSimulator:
     """
@@ -44,12 +69,20 @@ class NoCSimulator:
       (consistent with tb comment: unmatched messages buffered until Recv loads).
     """
 
-    def __init__(self, grid_shape: Tuple[int, int], core_configs: Dict[Tuple[int, int], CoreConfig]) -> None:
+    def __init__(self, grid_shape: Tuple[int, int], core_configs: Union[Dict[Tuple[int, int], CoreConfig], Sequence[Optional[CoreConfig]]]) -> None:
+        """
+        core_configs: either {(y, x): CoreConfig} or a dense row-major list indexed by y * w + x
+        (None / missing -> empty CoreConfig).
+        """
         self.h, self.w = grid_shape
-        self.cores: Dict[Tuple[int, int], CoreNode] = {}
+        dense = not isinstance(core_configs, dict)
+        # Cores live in a dense row-major list; internally a core is addressed by k = y * w + x
+        self._core_list: List[CoreNode] = []
+        # (core index, para_addr, message_num) -> (mem version, parsed table)
+        self._rte_cache: Dict[Tuple[int, int, int], Tuple[int, RouterTable]] = {}
         for y in range(self.h):
             for x in range(self.w):
-                cfg = core_configs.get((y, x), CoreConfig())
+                cfg = (core_configs[y * self.w + x] if dense else core_configs.get((y, x))) or CoreConfig()
                 node = CoreNode(
                     y=y,
                     x=x,
@@ -61,59 +94,68 @@ class NoCSimulator:
                     send_progress_by_idx={},
                 )
                 node.load_init_if_any(cfg.init_mem_path)
-                # Register node first so seeding helpers can access it via self.cores
-                self.cores[(y, x)] = node
+                self._core_list.append(node)
                 # Seed config-provided prims/messages into memory
-                self._seed_config_into_memory((y, x), cfg)
+                self._seed_config_into_memory(node, cfg)
                 node.prim_queue = self._parse_prims_from_memory(node.mem)
+                node.index_recv_bases()
+        # Public (y, x) -> core view of the same nodes
+        self.cores: Dict[Tuple[int, int], CoreNode] = {(n.y, n.x): n for n in self._core_list}
 
     # -------------------------- Helpers --------------------------
-    def _wrap_coord(self, y: int, x: int) -> Tuple[int, int]:
-        return (y % self.h, x % self.w)
+    def _wrap_index(self, y: int, x: int) -> int:
+        # torus wrap, returned as the dense core index
+        return (y % self.h) * self.w + (x % self.w)
 
-    def _find_recv_acceptor(self, dst: Tuple[int, int], tag: int) -> bool:
-        core = self.cores[dst]
-        for op in core.prim_queue:
-            if op.recv is not None and op.recv.tag_id == tag:
-                return True
-        return False
+    def _find_recv_acceptor(self, dst: int, tag: int) -> bool:
+        return tag in self._core_list[dst].recv_base_by_tag
 
     # -------------------------- Prim IO in memory --------------------------
-    def _seed_config_into_memory(self, coord: Tuple[int, int], cfg: CoreConfig) -> None:
-        node = self.cores[coord]
+    def _seed_config_into_memory(self, node: CoreNode, cfg: CoreConfig) -> None:
         # 1) Write configured prims into memory.
         #    If mem_addr is specified, honor it. Otherwise place sequentially from 0.
-        occupied = set()
-        for addr, buf in node.mem._cells.items():
-            # consider non-zero cells as occupied
-            if any(b != 0 for b in buf):
-                occupied.add(addr)
+        # consider non-zero cells as occupied
+        occupied = set(node.mem.nonzero_cells())
 
         # first pass: explicit addresses
         for op in (cfg.prim_queue or []):
             if op.mem_addr is not None:
                 cell_bytes = encode_prim_cell(op)
-                node.mem._cells[op.mem_addr] = bytearray(cell_bytes)
+                node.mem.write_cell(op.mem_addr, cell_bytes)
                 occupied.add(op.mem_addr)
 
-        # second pass: assign addresses for remaining ops sequentially from 0
+        # second pass: assign addresses for remaining ops sequentially from 0.
+        # Consecutive cells are gathered into runs and each run is written with one copy.
         next_addr = 0
+        run_start, run_cells = 0, []
         for op in (cfg.prim_queue or []):
             if op.mem_addr is None:
                 while next_addr in occupied and next_addr < node.mem.num_cells:
                     next_addr += 1
                 if next_addr >= node.mem.num_cells:
                     break
-                cell_bytes = encode_prim_cell(op)
-                node.mem._cells[next_addr] = bytearray(cell_bytes)
+                if run_cells and next_addr != run_start + len(run_cells):
+                    node.mem.write_bytes_linear(run_start, 0, b"".join(run_cells))
+                    run_cells = []
+                if not run_cells:
+                    run_start = next_addr
+                run_cells.append(encode_prim_cell(op))
                 occupied.add(next_addr)
                 next_addr += 1
+        if run_cells:
+            node.mem.write_bytes_linear(run_start, 0, b"".join(run_cells))
         # 2) For ops with inline send messages, write router table packets into memory at para_addr
         for op in (cfg.prim_queue or []):
             if op.send is not None and op.send.messages:
                 packets = [encode_packet_from_fields(m) for m in op.send.messages]
                 write_router_table_to_memory(node.mem, op.send.para_addr, packets)
 
+    def reparse_from_mem(self) -> None:
+        """Rebuild every core's prim queue from its current memory, without seeding again."""
+        for node in self._core_list:
+            node.prim_queue = self._parse_prims_from_memory(node.mem)
+            node.index_recv_bases()
+
     def _parse_prims_from_memory(self, mem: CoreMemory) -> List[PrimOp]:
         prims: List[PrimOp] = []
         addr = 0
@@ -129,22 +171,23 @@ class NoCSimulator:
     # -------------------------- Simulation --------------------------
     def run(self) -> None:
         """Execute all cores' prim_queue in round-robin order until all empty or stopped."""
-        indices = {k: 0 for k in self.cores.keys()}
-        stopped = {k: False for k in self.cores.keys()}  # Track stopped cores
-        remaining = sum(len(n.prim_queue) for n in self.cores.values())
+        core_list = self._core_list
+        indices = [0] * len(core_list)
+        stopped = [False] * len(core_list)  # Track stopped cores
+        remaining = sum(len(n.prim_queue) for n in core_list)
         while remaining > 0:
             progressed = False
-            for coord, node in self.cores.items():
-                if stopped[coord]:
+            for k, node in enumerate(core_list):
+                if stopped[k]:
                     # Skip cores that have encountered a stop primitive
                     continue
-                idx = indices[coord]
+                idx = indices[k]
                 if idx >= len(node.prim_queue):
                     continue
                 op = node.prim_queue[idx]
-                if op.kind == "stop":
+                if op.kind is PrimKind.STOP:
                     # Mark this core as stopped, no further primitives will be executed
-                    stopped[coord] = True
+                    stopped[k] = True
                 else:
                     # Execute recv first (to post acceptors), then send
                     if op.recv is not None:
@@ -166,47 +209,45 @@ class NoCSimulator:
                                 # not enough messages yet; do not advance this core; try next core
                                 continue
                         # If enough or no constraint, apply any buffered writes now
-                        self._execute_recv(coord, rp)
+                        self._execute_recv(k, rp)
                     if op.send is not None:
-                        self._prepare_router_msgs_if_needed(coord, op.send)
-                        send_done = self._execute_send(coord, op.send, idx)
+                        self._prepare_router_msgs_if_needed(k, op.send)
+                        send_done = self._execute_send(k, op.send, idx)
                         if not send_done:
                             # Send 被握手阻塞，不前进该核心的原语索引
                             continue
-                indices[coord] += 1
+                indices[k] += 1
                 remaining -= 1
                 progressed = True
             if not progressed:
                 break
             
-    def _prepare_router_msgs_if_needed(self, src: Tuple[int, int], sp: SendPrim) -> None:
+    def _prepare_router_msgs_if_needed(self, src: int, sp: SendPrim) -> None:
         if sp.messages:
             packets = [encode_packet_from_fields(m) for m in sp.messages]
-            write_router_table_to_memory(self.cores[src].mem, sp.para_addr, packets)
+            write_router_table_to_memory(self._core_list[src].mem, sp.para_addr, packets)
 
-    def _execute_send(self, src: Tuple[int, int], sp: SendPrim, prim_index: int) -> bool:
-        src_core = self.cores[src]
+    def _execute_send(self, src: int, sp: SendPrim, prim_index: int) -> bool:
+        src_core = self._core_list[src]
         msg_num = sp.message_num
         # Parse router table from source memory
-        rtes = parse_router_table_from_memory(src_core.mem, sp.para_addr, msg_num)
-        msg_counts = [r.cnt for r in rtes]
+        table = self._get_router_table(src, sp.para_addr, msg_num)
         # 从保存的进度开始顺序发送
         start_idx = src_core.send_progress_by_idx.get(prim_index, 0)
-        for msg_idx in range(start_idx, len(rtes)):
-            rte = rtes[msg_idx]
-            if not rte.en:
+        for msg_idx in range(start_idx, len(table)):
+            if not table.en[msg_idx]:
                 # Skip data consumption as per spec
                 src_core.send_progress_by_idx[prim_index] = msg_idx + 1
                 continue
             # Resolve destination core (wrap torus-like)
-            dst = self._wrap_coord(src_core.y + rte.y, src_core.x + rte.x)
+            dst = self._wrap_index(src_core.y + table.y[msg_idx], src_core.x + table.x[msg_idx])
             # 若该消息需要握手且目的端尚无接收者，则阻塞在此条消息
-            if rte.handshake and not self._find_recv_acceptor(dst, rte.tag_id):
+            if table.handshake[msg_idx] and not self._find_recv_acceptor(dst, table.tag_id[msg_idx]):
                 return False
             if sp.cell_or_neuron == 0:
-                self._send_cell_mode(src_core, dst, sp, rte, msg_idx, msg_counts)
+                self._send_cell_mode(src_core, dst, sp, table, msg_idx)
             else:
-                self._send_neuron_mode(src_core, dst, sp, rte, msg_idx, msg_counts)
+                self._send_neuron_mode(src_core, dst, sp, table, msg_idx)
             # 完成一条消息，推进进度
             src_core.send_progress_by_idx[prim_index] = msg_idx + 1
         # 所有消息完成，清理进度并返回 True
@@ -214,161 +255,176 @@ class NoCSimulator:
             del src_core.send_progress_by_idx[prim_index]
         return True
 
-    def _buffer_send_payload(self, src_core: CoreNode, dst_coord: Tuple[int, int], sp: SendPrim, rte: RouterTableEntry, msg_idx: int, msg_counts: List[int]) -> None:
+    def _get_router_table(self, src: int, para_addr: int, msg_num: int) -> RouterTable:
+        # Re-parse only if the source memory was written since the last lookup
+        mem = self._core_list[src].mem
+        key = (src, para_addr, msg_num)
+        hit = self._rte_cache.get(key)
+        if hit is not None and hit[0] == mem._version:
+            return hit[1]
+        table = RouterTable.from_memory(mem, para_addr, msg_num)
+        self._rte_cache[key] = (mem._version, table)
+        return table
+
+    def _buffer_send_payload(self, src_core: CoreNode, dst: int, sp: SendPrim, table: RouterTable, msg_idx: int) -> None:
         # Materialize payload bytes as if we would send (for simplicity) and stash by tag at destination.
-        dst_core = self.cores[dst_coord]
-        tag = rte.tag_id
+        dst_core = self._core_list[dst]
+        tag = table.tag_id[msg_idx]
+        prev = table.prev_cnt[msg_idx]
+        cnt = table.cnt[msg_idx]
         if tag not in dst_core.pending_by_tag:
-            dst_core.pending_by_tag[tag] = []
+            dst_core.pending_by_tag[tag] = PendingTag(data=bytearray(), msgs=[])
         if sp.cell_or_neuron == 0:
             # Flatten this message's cells into 4x8B segments in final packet order
-            cell_per_message = rte.cnt
-            data = bytearray()
-            src_cell_base = sp.send_addr + sum(msg_counts[:msg_idx])
-            for i in range(cell_per_message):
-                cell = src_core.mem.read_cell(src_cell_base + i)
-                data.extend(cell)  # 32B per cell
-            dst_core.pending_by_tag[tag].append((True, rte.__dict__, bytes(data)))
+            cell_per_message = cnt
+            src_cell_base = sp.send_addr + prev
+            data = src_core.mem.read_bytes_linear(src_cell_base, 0, cell_per_message * 32)  # 32B per cell
+            dst_core.pending_by_tag[tag].append(True, table.a0[msg_idx], table.a_offset[msg_idx], table.group_size[msg_idx], data)
         else:
-            neuron_per_message = rte.cnt if rte.cnt != 0 else 1
-            prev = sum(msg_counts[:msg_idx])
+            neuron_per_message = cnt if cnt != 0 else 1
             start_cell = sp.send_addr + (prev // 32)
             start_off = prev % 32
-            data = bytearray()
-            for _ in range(neuron_per_message):
-                b = src_core.mem.read_bytes_linear(start_cell, start_off, 1)
-                data.extend(b)
-                start_off += 1
-                if start_off == 32:
-                    start_off = 0
-                    start_cell += 1
-            dst_core.pending_by_tag[tag].append((False, rte.__dict__, bytes(data)))
+            data = src_core.mem.read_bytes_linear(start_cell, start_off, neuron_per_message)
+            dst_core.pending_by_tag[tag].append(False, table.a0[msg_idx], table.a_offset[msg_idx], table.group_size[msg_idx], data)
 
     # -------------------------- Send modes --------------------------
-    def _send_cell_mode(self, src_core: CoreNode, dst_coord: Tuple[int, int], sp: SendPrim, rte: RouterTableEntry, msg_idx: int, msg_counts: List[int]) -> None:
+    def _send_cell_mode(self, src_core: CoreNode, dst: int, sp: SendPrim, table: RouterTable, msg_idx: int) -> None:
         #TODO: need to review 
 
-        dst_core = self.cores[dst_coord]
+        dst_core = self._core_list[dst]
+        tag = table.tag_id[msg_idx]
+        prev = table.prev_cnt[msg_idx]
         # Number of cells for this message 
-        cell_per_message = rte.cnt
-        group_size = rte.group_size
-        a = rte.a0  # 8B addressing for cell mode
+        cell_per_message = table.cnt[msg_idx]
         # Starting src cell index for this message
-        src_cell_base = sp.send_addr + sum(msg_counts[:msg_idx])
-        # Iterate per cell
-        for i in range(cell_per_message):
-            src_cell_addr = src_cell_base + i
-            # Build 4x8B segments from source cell
-            cell_data = src_core.mem.read_cell(src_cell_addr)
-            for seg in range(4):
-                data8 = cell_data[seg * 8 : seg * 8 + 8]
-                cell_delta, seg_idx = iter_cells_span_from_A_8B(a)
-                dst_cell_addr = dst_core_offset_cell(dst_core, sp, rte, cell_delta)
-                dst_seg_idx = seg_idx
-                dst_core.mem.write_8B(dst_cell_addr, dst_seg_idx, data8)
-                a += 1  # next 8B packet increases A by 1 in 8B units
-            # After finishing one cell, handle A_offset/Const step
-            if ((i + 1) % group_size) == 0:
-                # After a group, adjust so that distance (last_8B -> next_first_8B) equals A_offset.
-                # Since 'a' is already last+1, we add (A_offset - 1).
-                a += (rte.a_offset - 1)
+        src_cell_base = sp.send_addr + prev
+        recv_base = dst_core.recv_base_by_tag.get(tag, 0)
+        a0, group_size, a_offset = table.a0[msg_idx], table.group_size[msg_idx], table.a_offset[msg_idx]
+        if src_core is dst_core:
+            # Self-send: if the source cells overlap the destination runs, each cell must be read
+            # after the earlier cells have landed, so copy in streaming order instead of one snapshot
+            src = src_cell_base * MEM_CELL_BYTES
+            length = cell_per_message * MEM_CELL_BYTES
+            dst_start, run, step = recv_base * MEM_CELL_BYTES + a0 * 8, group_size * 32, (group_size * 4 + a_offset - 1) * 8
+            if _runs_overlap(src, length, dst_start, run, step):
+                _stream_runs(dst_core.mem, src, length, dst_start, run, step, MEM_CELL_BYTES)
+                self._increment_delivered(dst, tag, 1)
+                return
+        payload = src_core.mem.read_bytes_linear(src_cell_base, 0, cell_per_message * 32)
+        _scatter_cells(dst_core.mem, recv_base, a0, payload, group_size, a_offset)
         # one message completed -> increment delivered count at destination for this tag
-        self._increment_delivered(dst_coord, rte.tag_id, 1)
+        self._increment_delivered(dst, tag, 1)
 
-    def _send_neuron_mode(self, src_core: CoreNode, dst_coord: Tuple[int, int], sp: SendPrim, rte: RouterTableEntry, msg_idx: int, msg_counts: List[int]) -> None:
-        dst_core = self.cores[dst_coord]
-        neuron_per_message = rte.cnt
-        group_size = rte.group_size
-        a = rte.a0  # 1B addressing in neuron mode
+    def _send_neuron_mode(self, src_core: CoreNode, dst: int, sp: SendPrim, table: RouterTable, msg_idx: int) -> None:
+        dst_core = self._core_list[dst]
+        tag = table.tag_id[msg_idx]
+        prev = table.prev_cnt[msg_idx]
+        neuron_per_message = table.cnt[msg_idx]
         # Neuron stream starts at send_addr cell boundary for first message, then continues across messages
-        # Compute byte stream offset from start of send_addr across previous messages
-        prev_neurons = sum(msg_counts[:msg_idx])
-        # Start reading from send_addr (32B aligned), but with byte offset prev_neurons % 32
-        start_cell = sp.send_addr + (prev_neurons // 32)
-        start_off = prev_neurons % 32
-        remaining = neuron_per_message
-        # Consume source bytes and write to destination according to A progression
-        while remaining > 0:
-            chunk = min(remaining, 1)
-            data_byte = src_core.mem.read_bytes_linear(start_cell, start_off, 1)
-            byte_val = data_byte[0]
-            cell_delta, byte_idx = iter_cells_span_from_A_1B(a)
-            dst_cell_addr = dst_core_offset_cell(dst_core, sp, rte, cell_delta)
-            dst_core.mem.write_1B(dst_cell_addr, byte_idx, byte_val)
-            # Advance source pointer by 1 byte
-            start_off += 1
-            if start_off == 32:
-                start_off = 0
-                start_cell += 1
-            remaining -= 1
-            # A increments by 1 per 1B
-            a += 1
-            # After finishing a group of group_size neurons, apply A_offset
-            sent_count = (neuron_per_message - remaining)
-            if (sent_count % group_size) == 0:
-                a += (rte.a_offset - 1)
+        # prev: byte stream offset from start of send_addr across previous messages
+        # Start reading from send_addr (32B aligned), but with byte offset prev % 32
+        start_cell = sp.send_addr + (prev // 32)
+        start_off = prev % 32
+        recv_base = dst_core.recv_base_by_tag.get(tag, 0)
+        a0, group_size, a_offset = table.a0[msg_idx], table.group_size[msg_idx], table.a_offset[msg_idx]
+        if src_core is dst_core:
+            # Self-send: if the source bytes overlap the destination runs, each byte must be read
+            # after the earlier bytes have landed, so copy in streaming order instead of one snapshot
+            src = start_cell * MEM_CELL_BYTES + start_off
+            dst_start, step = recv_base * MEM_CELL_BYTES + a0, group_size + a_offset - 1
+            if _runs_overlap(src, neuron_per_message, dst_start, group_size, step):
+                _stream_runs(dst_core.mem, src, neuron_per_message, dst_start, group_size, step, 1)
+                self._increment_delivered(dst, tag, 1)
+                return
+        payload = src_core.mem.read_bytes_linear(start_cell, start_off, neuron_per_message)
+        _scatter_neurons(dst_core.mem, recv_base, a0, payload, group_size, a_offset)
         # one message completed -> increment delivered count at destination for this tag
-        self._increment_delivered(dst_coord, rte.tag_id, 1)
+        self._increment_delivered(dst, tag, 1)
 
     # -------------------------- Recv --------------------------
-    def _execute_recv(self, dst: Tuple[int, int], rp: RecvPrim) -> None:
+    def _execute_recv(self, dst: int, rp: RecvPrim) -> None:
         # Apply any buffered messages for this tag if exist
-        dst_core = self.cores[dst]
+        dst_core = self._core_list[dst]
         tag = rp.tag_id
         if tag not in dst_core.pending_by_tag:
             return
-        pending_list = dst_core.pending_by_tag.pop(tag)
-        # As we don't have original RTE fields for A progression per message in buffer,
-        # we stored rte.__dict__. Use it to reconstruct minimal fields.
-        for is_cell_mode, rte_fields, payload in pending_list:
-            rte = RouterTableEntry.from_packet128(encode_packet_from_fields(rte_fields))
+        pending = dst_core.pending_by_tag.pop(tag)
+        data = memoryview(pending.data)
+        off = 0
+        # Each buffered message carries the A progression fields it was sent with
+        recv_base = dst_core.recv_base_by_tag.get(tag, 0)
+        for is_cell_mode, a0, a_offset, group_size, length in pending.msgs:
+            payload = data[off : off + length]
+            off += length
             if is_cell_mode:
                 # Re-emit write with the same logic as _send_cell_mode but using payload
-                a = rte.a0
-                group_size = rte.group_size
-                # payload is 32B * cells
-                for i in range(0, len(payload), 32):
-                    cell_bytes = payload[i : i + 32]
-                    for seg in range(4):
-                        data8 = cell_bytes[seg * 8 : seg * 8 + 8]
-                        cell_delta, seg_idx = iter_cells_span_from_A_8B(a)
-                        dst_cell_addr = dst_core_offset_cell(dst_core, None, rte, cell_delta)
-                        dst_core.mem.write_8B(dst_cell_addr, seg_idx, data8)
-                        a += 1
-                    sent_cells = (i // 32) + 1
-                    if (sent_cells % group_size) == 0:
-                        a += (rte.a_offset - 1)
+                _scatter_cells(dst_core.mem, recv_base, a0, payload, group_size, a_offset)
             else:
-                a = rte.a0
-                group_size = rte.group_size
-                for idx, byte_val in enumerate(payload):
-                    cell_delta, byte_idx = iter_cells_span_from_A_1B(a)
-                    dst_cell_addr = dst_core_offset_cell(dst_core, None, rte, cell_delta)
-                    dst_core.mem.write_1B(dst_cell_addr, byte_idx, byte_val)
-                    a += 1
-                    if ((idx + 1) % group_size) == 0:
-                        a += (rte.a_offset - 1)
+                _scatter_neurons(dst_core.mem, recv_base, a0, payload, group_size, a_offset)
             # one buffered message applied -> increment delivered count
-            self._increment_delivered(dst, rte.tag_id, 1)
+            self._increment_delivered(dst, tag, 1)
 
 
 # -------------------------- Small utilities --------------------------
-def dst_core_offset_cell(dst_core: CoreNode, sp: SendPrim, rte: RouterTableEntry, cell_delta: int) -> int:
-    # recv base for destination is provided by its Recv(tag) with matching tag; if multiple recv prims for same tag,
-    # we choose the first
-    recv_base = 0
-    for op in dst_core.prim_queue:
-        if op.recv is not None and op.recv.tag_id == rte.tag_id:
-            recv_base = op.recv.recv_addr
-            break
-    return recv_base + cell_delta
+def _scatter_cells(mem: CoreMemory, recv_base: int, a: int, payload: bytes, group_size: int, a_offset: int) -> None:
+    # Cell-mode A progression (8B units): the 4x8B packets of a cell take consecutive
+    # A values and A gets an extra (A_offset - 1) after every group of group_size cells.
+    # So each group is one contiguous run at A*8 bytes from recv_base (spanning cells
+    # when A is not 4-aligned), and consecutive runs start (4*group_size + A_offset - 1) apart.
+    if a_offset == 1:
+        # No gap between groups: the whole message is a single contiguous copy
+        cell_delta, seg_idx = iter_cells_span_from_A_8B(a)
+        mem.write_bytes_linear(recv_base + cell_delta, seg_idx * 8, payload)
+        return
+    run = group_size * 32
+    step = group_size * 4 + a_offset - 1
+    for i in range(0, len(payload), run):
+        # inlined iter_cells_span_from_A_8B: (cell_delta, seg_idx) = (a >> 2, a & 0x3)
+        mem.write_bytes_linear(recv_base + (a >> 2), (a & 0x3) * 8, payload[i : i + run])
+        a += step
+
+def _scatter_neurons(mem: CoreMemory, recv_base: int, a: int, payload: bytes, group_size: int, a_offset: int) -> None:
+    # Neuron-mode A progression (1B units): A grows by 1 per byte and by an extra
+    # (A_offset - 1) after every group, so each group of group_size bytes is one
+    # contiguous run and consecutive runs start (group_size + A_offset - 1) apart.
+    if a_offset == 1:
+        # No gap between groups: the whole message is a single contiguous copy
+        cell_delta, byte_idx = iter_cells_span_from_A_1B(a)
+        mem.write_bytes_linear(recv_base + cell_delta, byte_idx, payload)
+        return
+    step = group_size + a_offset - 1
+    for i in range(0, len(payload), group_size):
+        # inlined iter_cells_span_from_A_1B: (cell_delta, byte_idx) = (a >> 5, a & 0x1F)
+        mem.write_bytes_linear(recv_base + (a >> 5), a & 0x1F, payload[i : i + group_size])
+        a += step
+
+def _runs_overlap(src: int, length: int, dst: int, run: int, step: int) -> bool:
+    # Does [src, src + length) intersect the hull of the destination runs? (linear byte addresses)
+    last = dst + ((length - 1) // run) * step
+    return min(dst, last) < src + length and src < max(dst, last) + run
+
+def _stream_runs(mem: CoreMemory, src: int, length: int, dst: int, run: int, step: int, unit: int) -> None:
+    # Copy `length` bytes from linear byte address src into runs of `run` bytes starting at dst,
+    # `step` bytes apart, with the same result as copying unit by unit (unit = 32B cell / 1B neuron),
+    # each unit read after all earlier ones were written. Within a run a chunk can be copied in one
+    # go as long as it does not reach source bytes it overwrites itself: any size when the
+    # destination is behind the source, at most (dst - src) bytes when it is ahead.
+    for i in range(0, length, run):
+        n = min(run, length - i)
+        s = src + i
+        lag = dst - s
+        chunk = n if lag <= 0 else max(unit, lag // unit * unit)
+        for j in range(0, n, chunk):
+            data = mem.read_bytes_linear((s + j) // MEM_CELL_BYTES, (s + j) % MEM_CELL_BYTES, min(chunk, n - j))
+            mem.write_bytes_linear((dst + j) // MEM_CELL_BYTES, (dst + j) % MEM_CELL_BYTES, data)
+        dst += step
 
 def _safe_inc(d: Dict[int, int], key: int, delta: int = 1) -> None:
     d[key] = d.get(key, 0) + delta
 
 # Bind helper into class namespace (instance method style)
-def _increment_delivered(self: NoCSimulator, dst_coord: Tuple[int, int], tag: int, count: int = 1) -> None:
-    node = self.cores[dst_coord]
+def _increment_delivered(self: NoCSimulator, dst: int, tag: int, count: int = 1) -> None:
+    node = self._core_list[dst]
     _safe_inc(node.delivered_count_by_tag, tag, count)
 
 # Attach method to class
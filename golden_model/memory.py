@@ -1,18 +1,21 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
-from typing import Dict, Iterable, Tuple
+from typing import Iterable, List, Tuple
 
 MEM_CELL_BYTES = 32  # 256-bit wide
 
-def _hex_to_bytes_32B(hex_str: str) -> bytes:
+_NONZERO_RUN = re.compile(rb"[^\x00]+")
+
+def _normalize_hex_32B(hex_str: str) -> str:
     s = "".join(hex_str.strip().split())
     # Accept longer/shorter by trimming/padding to 32B
     if len(s) < MEM_CELL_BYTES * 2:
         s = s.zfill(MEM_CELL_BYTES * 2)
     elif len(s) > MEM_CELL_BYTES * 2:
         s = s[-MEM_CELL_BYTES * 2 :]
-    return bytes.fromhex(s)
+    return s
 
 @dataclass
 class CoreMemory:
@@ -27,7 +30,26 @@ class CoreMemory:
     num_cells: int = 24576
 
     def __post_init__(self) -> None:
-        self._cells: Dict[int, bytearray] = {}
+        # One contiguous buffer for the whole SRAM; cell `addr` lives at
+        # [addr * MEM_CELL_BYTES : (addr + 1) * MEM_CELL_BYTES].
+        self._buf = bytearray(self.num_cells * MEM_CELL_BYTES)
+        # Flat zero-copy view of the same buffer: slicing it does not copy,
+        # so reads pay for a single bytes() copy only.
+        self._flat = memoryview(self._buf)
+        self._flat_ro = self._flat.toreadonly()
+        # Bumped on every write; lets callers cache data decoded from memory.
+        self._version = 0
+
+    # memoryviews cannot be pickled / deep-copied: drop them and rebuild from _buf
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_flat"], state["_flat_ro"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._flat = memoryview(self._buf)
+        self._flat_ro = self._flat.toreadonly()
 
     # -------------------------- Load/Store --------------------------
     def load_from_inputs_file(self, path: str) -> None: 
@@ -35,6 +57,8 @@ class CoreMemory:
         Parse lines like: '@0000 <64-hex>' and fill memory cells.
         Extra whitespace after hex is ignored. Lines not starting with '@' are ignored.
         """
+        addrs: List[int] = []
+        hex_cells: List[str] = []
         with open(path, "r") as f:
             for line in f:
                 line = line.strip()
@@ -47,41 +71,90 @@ class CoreMemory:
                     # Out-of-range lines are ignored (compatible with partial images)
                     continue
                 payload = "".join(rest) if rest else ""
-                data = _hex_to_bytes_32B(payload)
-                self._cells[addr] = bytearray(data)
+                addrs.append(addr)
+                hex_cells.append(_normalize_hex_32B(payload))
+        # Decode the whole image in one pass, then copy runs of consecutive addresses
+        # with one slice each (later lines for the same address still win).
+        data = bytes.fromhex("".join(hex_cells))
+        run_start = 0
+        for i in range(1, len(addrs) + 1):
+            if i == len(addrs) or addrs[i] != addrs[i - 1] + 1:
+                start = addrs[run_start] * MEM_CELL_BYTES
+                self._buf[start : start + (i - run_start) * MEM_CELL_BYTES] = data[run_start * MEM_CELL_BYTES : i * MEM_CELL_BYTES]
+                run_start = i
+        self._version += 1
 
     def dump_to_file(self, path: str, start_addr: int = 0, num_cells: int | None = None) -> None:
         if num_cells is None:
             num_cells = self.num_cells - start_addr
+        if num_cells > 0:
+            self._bounds_check_cell(start_addr)
+            self._bounds_check_cell(start_addr + num_cells - 1)
+        # Hex the whole span once and write it as a single string
+        h = self._flat[start_addr * MEM_CELL_BYTES:(start_addr + num_cells) * MEM_CELL_BYTES].hex()
+        text = "".join([f"@{start_addr + j:04x} {h[j * 64:j * 64 + 64]}\n" for j in range(num_cells)])
         with open(path, "w") as f:
-            for i in range(start_addr, start_addr + num_cells):
-                data = self.read_cell(i)
-                f.write(f"@{i:04x} {data.hex()}\n")
+            f.write(text)
 
     # -------------------------- Read helpers --------------------------
-    def read_cell(self, addr: int) -> bytes:
+    def read_cell(self, addr: int) -> memoryview:
+        """
+        Zero-copy, read-only view of one 32B cell. The view tracks later writes;
+        take bytes(...) of it if a snapshot is needed.
+        """
         self._bounds_check_cell(addr)
-        return bytes(self._cells.get(addr, bytearray(MEM_CELL_BYTES)))
+        start = addr * MEM_CELL_BYTES
+        return self._flat_ro[start : start + MEM_CELL_BYTES]
 
     def read_bytes_linear(self, start_cell_addr: int, start_byte_offset: int, length: int) -> bytes:
         """
         Read arbitrary-length byte window crossing 32B cell boundaries.
+        Returns a copy taken at call time: copying a whole window and writing it
+        elsewhere in the same memory only matches a unit-by-unit copy when the
+        two ranges do not overlap.
         """
         assert 0 <= start_byte_offset < MEM_CELL_BYTES
-        out = bytearray()
-        cell = start_cell_addr
-        off = start_byte_offset
-        remaining = length
-        while remaining > 0:
-            chunk = min(remaining, MEM_CELL_BYTES - off)
-            data = self.read_cell(cell)
-            out.extend(data[off : off + chunk])
-            remaining -= chunk
-            cell += 1
-            off = 0
-        return bytes(out)
+        if length <= 0:
+            return b""
+        self._bounds_check_cell(start_cell_addr)
+        self._bounds_check_cell(start_cell_addr + (start_byte_offset + length - 1) // MEM_CELL_BYTES)
+        start = start_cell_addr * MEM_CELL_BYTES + start_byte_offset
+        return bytes(self._flat[start : start + length])
+
+    def nonzero_cells(self) -> Iterable[int]:
+        """Yield addresses (ascending) of cells holding at least one non-zero byte."""
+        # The regex engine skips zero bytes in C; we only touch the non-zero runs.
+        last = -1
+        for m in _NONZERO_RUN.finditer(self._buf):
+            first = max(m.start() // MEM_CELL_BYTES, last + 1)
+            last = (m.end() - 1) // MEM_CELL_BYTES
+            yield from range(first, last + 1)
+
+    # -------------------------- Full-cell writes --------------------------
+    def write_cell(self, addr: int, data: bytes) -> None:
+        """Overwrite one whole 32B cell."""
+        self._bounds_check_cell(addr)
+        if len(data) != MEM_CELL_BYTES:
+            raise ValueError("data must be exactly 32 bytes")
+        start = addr * MEM_CELL_BYTES
+        self._buf[start : start + MEM_CELL_BYTES] = data
+        self._version += 1
 
     # -------------------------- Masked writes --------------------------
+    def write_bytes_linear(self, start_cell_addr: int, start_byte_offset: int, data: bytes) -> None:
+        """
+        Write an arbitrary-length byte window crossing 32B cell boundaries.
+        """
+        assert 0 <= start_byte_offset < MEM_CELL_BYTES
+        length = len(data)
+        if length == 0:
+            return
+        self._bounds_check_cell(start_cell_addr)
+        self._bounds_check_cell(start_cell_addr + (start_byte_offset + length - 1) // MEM_CELL_BYTES)
+        start = start_cell_addr * MEM_CELL_BYTES + start_byte_offset
+        self._buf[start : start + length] = data
+        self._version += 1
+
     def write_8B(self, cell_addr: int, segment_idx: int, data8: bytes) -> None:
         """Write one 8B segment (segment_idx in [0..3]) into a 32B cell."""
         self._bounds_check_cell(cell_addr)
@@ -89,9 +162,9 @@ class CoreMemory:
             raise ValueError("segment_idx must be in 0..3")
         if len(data8) != 8:
             raise ValueError("data8 must be exactly 8 bytes")
-        base = self._get_cell_buf(cell_addr)
-        start = segment_idx * 8
-        base[start : start + 8] = data8
+        start = cell_addr * MEM_CELL_BYTES + segment_idx * 8
+        self._buf[start : start + 8] = data8
+        self._version += 1
 
     def write_1B(self, cell_addr: int, byte_idx: int, value: int) -> None:
         """Write a single byte (0..255) into a 32B cell at byte_idx (0..31)."""
@@ -100,15 +173,10 @@ class CoreMemory:
             raise ValueError("byte_idx must be in 0..31")
         if not (0 <= value <= 0xFF):
             raise ValueError("value must be a byte")
-        base = self._get_cell_buf(cell_addr)
-        base[byte_idx] = value
+        self._buf[cell_addr * MEM_CELL_BYTES + byte_idx] = value
+        self._version += 1
 
     # -------------------------- Internal --------------------------
-    def _get_cell_buf(self, addr: int) -> bytearray:
-        if addr not in self._cells:
-            self._cells[addr] = bytearray(MEM_CELL_BYTES)
-        return self._cells[addr]
-
     def _bounds_check_cell(self, addr: int) -> None:
         if not (0 <= addr < self.num_cells):
             raise IndexError(f"cell addr out of range: {addr}")
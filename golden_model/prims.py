@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import struct
+import sys
 from dataclasses import dataclass
-from typing import List, Optional, Literal, Union
-
-from myhdl import bin, intbv
+from enum import IntEnum
+from functools import lru_cache
+from typing import List, Optional, Sequence
 
 def to_signed_bits(val, width=16):
     if not -(1 << (width-1)) <= val < (1 << (width-1)):
@@ -15,7 +17,10 @@ def to_unsigned_bits(val, width=16):
         raise ValueError("超出范围: %d位无符号数" % width)
     return val & ((1 << width) - 1) 
 
-@dataclass
+# Prim objects are created per queue entry; use __slots__ where dataclasses support it (3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class SendPrim:
     """
     High-level Send primitive.
@@ -39,7 +44,7 @@ class SendPrim:
     messages: Optional[List[dict]] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class RecvPrim:
     """
     High-level Recv primitive.
@@ -61,7 +66,7 @@ class RecvPrim:
     use_end_num: bool = False
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class StopPrim:
     """
     High-level Stop primitive.
@@ -71,9 +76,27 @@ class StopPrim:
     pass
 
 
-@dataclass
+# StopPrim carries no state, so every stop op shares this instance
+STOP_SINGLETON = StopPrim()
+
+
+class PrimKind(IntEnum):
+    """Prim op kind; values match the PRIM_KIND_* codes used in the memory encoding."""
+    SEND = 1
+    RECV = 2
+    STOP = 3
+
+    def __str__(self) -> str:
+        return self.name.lower()
+
+
+# Config/JSON spelling -> PrimKind
+_KIND_FROM_STR = {"send": PrimKind.SEND, "recv": PrimKind.RECV, "stop": PrimKind.STOP}
+
+
+@dataclass(**_SLOTS)
 class PrimOp:
-    kind: Literal["send", "recv", "stop"]
+    kind: PrimKind
     send: Optional[SendPrim] = None
     recv: Optional[RecvPrim] = None
     stop: Optional[StopPrim] = None
@@ -81,142 +104,158 @@ class PrimOp:
     # this 32B cell address before parsing prim queue from memory.
     mem_addr: Optional[int] = None
 
+    def __post_init__(self) -> None:
+        # Back-compat: accept the old string kinds ("send"/"recv"/"stop")
+        if isinstance(self.kind, str):
+            self.kind = _KIND_FROM_STR[self.kind]
+
 
 # -------------------------- Prim encoding in memory --------------------------
 # One primitive per 32B cell (256 bits) starting at address 0x0.
 # All-zero cell (or uninitialized) marks end of prim queue.
 # Unified Layout (supports send and recv in the same primitive):
-# Using bit-level encoding with intbv:
+# Bit positions (LSB = bit0 of the 256-bit cell, stored big-endian):
 #   FLAGS:
+#     bit[4:0]   : 0x6 (opcode)
 #     bit[4]     : send_valid flag (1=enabled, 0=disabled)
 #     bit[5]     : recv_valid flag (1=enabled, 0=disabled)
+#     bit[16:8]  : deps (u8, shared; recv value wins when both are present)
 #   SEND (present if bit[4] == 1):
-#     bit[48]         : cell_or_neuron (0=cell, 1=neuron)
 #     bit[64:48]      : send_addr (u16, 32B addressing)
-#     bit[80:64]      : message_num_minus1 (stored as N-1)
-#     bit[96:80]      : para_addr (u16, 32B addressing)
+#     bit[168]        : cell_or_neuron (0=cell, 1=neuron)
+#     bit[184:176]    : message_num_minus1 (stored as N-1)
+#     bit[256:240]    : para_addr (u16, 32B addressing)
 #   RECV (present if bit[5] == 1):
-#     bit[112:96]     : recv_addr (u16, 32B addressing)
-#     bit[120:112]    : tag_id (u8)
-#     bit[128:120]    : end_num (u8, optional; 0 if unused)
-#     bit[136:128]    : relay_mode (u8)
-#     bit[144:136]    : mc_y (u8)
-#     bit[152:144]    : mc_x (u8)
+#     bit[48:32]      : recv_addr (u16, 32B addressing)
+#     bit[174:172]    : CXY / relay_mode (u2)
+#     bit[190:184]    : mc_y (s6)
+#     bit[198:192]    : mc_x (s6)
+#     bit[208:200]    : tag_id (u8)
+#     bit[216:208]    : end_num (u8, optional; 0 if unused)
 #   STOP (special encoding):
-#     bit[8:0]   : 0x03 (PRIM_KIND_STOP)
+#     bit[8:4]   : 0x3 (PRIM_KIND_STOP)
 #     bit[256:8] : reserved (0)
 
-PRIM_KIND_SEND = 1
-PRIM_KIND_RECV = 2
-PRIM_KIND_STOP = 3
+PRIM_KIND_SEND = PrimKind.SEND
+PRIM_KIND_RECV = PrimKind.RECV
+PRIM_KIND_STOP = PrimKind.STOP
+
+_ZERO_CELL = bytes(32)
+
+_PRIM_OPCODE = 0x6
+_SEND_VALID = 1 << 4
+_RECV_VALID = 1 << 5
+
+# Every field above is byte-aligned, so the big-endian cell is packed/unpacked
+# with one precompiled struct (byte i holds bits [256-8i : 248-8i]):
+#   [0:2] para_addr  [5] end_num  [6] tag_id  [7] mc_x  [8] mc_y  [9] message_num_minus1
+#   [10] CXY << 4 | cell_or_neuron  [24:26] send_addr  [26:28] recv_addr  [30] deps  [31] flags
+_PRIM_CELL = struct.Struct(">H3xBBBBBB13xHH2xBB")
 
 
 def encode_prim_cell(op: "PrimOp") -> bytes:
     """使用位级别编码原语，返回32字节"""
-    pic = intbv(0, min=0, max=(1<<256))
-    
     # STOP special-case
-    if op.kind == "stop":
-        pic[4:0] = 0
-        pic[8:4] = 3
-        return int(pic).to_bytes(32, byteorder='big')
+    if op.kind is PrimKind.STOP:
+        return _PRIM_CELL.pack(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, PRIM_KIND_STOP << 4)
 
+    flags = 0
+    deps = 0
+    send_addr = cell_or_neuron = msg_minus1 = para_addr = 0
+    recv_addr = cxy = mc_x = mc_y = tag_id = end_num = 0
     # Unified encoding with flags at bit[4] (send) and bit[5] (recv)
     if op.send is not None:
-        pic[4:0] = 0x6
-        pic[4] = 1  # send_valid flag
-        pic[16:8] = to_unsigned_bits(op.send.deps)
-        pic[64:48] = to_unsigned_bits(op.send.send_addr, 16)
-        pic[168] = to_unsigned_bits(op.send.cell_or_neuron, 1)
+        flags |= _PRIM_OPCODE | _SEND_VALID
+        deps = to_unsigned_bits(op.send.deps, 8)
+        send_addr = to_unsigned_bits(op.send.send_addr, 16)
+        cell_or_neuron = to_unsigned_bits(op.send.cell_or_neuron, 1)
         # message_num uses minus-one storage (N-1). Accept 0 as 0 (meaning 1 after decode)
-        pic[184:176] = to_unsigned_bits(max(0, op.send.message_num - 1), 8)
-        pic[256:240] = to_unsigned_bits(op.send.para_addr, 16)
+        msg_minus1 = to_unsigned_bits(max(0, op.send.message_num - 1), 8)
+        para_addr = to_unsigned_bits(op.send.para_addr, 16)
 
     if op.recv is not None:
-        pic[4:0] = 0x6
-        pic[5] = 1  # recv_valid flag
-        pic[16:8] = to_unsigned_bits(op.recv.deps)
-        pic[48:32] = to_unsigned_bits(op.recv.recv_addr, 16)
-        pic[174:172] = to_unsigned_bits(op.recv.CXY, 2)
-        pic[198:192] = to_signed_bits(op.recv.mc_x, 6)
-        pic[190:184] = to_signed_bits(op.recv.mc_y, 6)
-        pic[208:200] = to_unsigned_bits(op.recv.tag_id, 8)
-        pic[216:208] = to_unsigned_bits(op.recv.end_num, 8)
+        flags |= _PRIM_OPCODE | _RECV_VALID
+        deps = to_unsigned_bits(op.recv.deps, 8)
+        recv_addr = to_unsigned_bits(op.recv.recv_addr, 16)
+        cxy = to_unsigned_bits(op.recv.CXY, 2)
+        mc_x = to_signed_bits(op.recv.mc_x, 6)
+        mc_y = to_signed_bits(op.recv.mc_y, 6)
+        tag_id = to_unsigned_bits(op.recv.tag_id, 8)
+        end_num = to_unsigned_bits(op.recv.end_num, 8)
 
     # If neither flag is set, returns zeroed cell (terminator)
-    return int(pic).to_bytes(32, byteorder='big')
+    return _PRIM_CELL.pack(
+        para_addr, end_num, tag_id, mc_x, mc_y, msg_minus1,
+        (cxy << 4) | cell_or_neuron, send_addr, recv_addr, deps, flags,
+    )
 
 
 def decode_prim_cell(cell_bytes: bytes) -> Optional["PrimOp"]:
-    """使用位级别解码原语，从32字节解析"""
+    """
+    使用位级别解码原语，从32字节解析。
+    Every call returns new PrimOp/SendPrim/RecvPrim objects, so callers may mutate them freely.
+    """
     if len(cell_bytes) != 32:
         raise ValueError("prim cell must be 32 bytes")
-    
-    # 将字节转换为 intbv
-    pic = intbv(int.from_bytes(cell_bytes, byteorder='big'), min=0, max=(1<<256))
-    
-    # 检查是否全零
-    if int(pic) == 0:
+
+    # 检查是否全零（字节级比较，避免构造大整数）
+    if cell_bytes == _ZERO_CELL:
+        return None
+
+    # Key on an immutable copy, the caller may pass a view into live memory
+    fields = _decode_prim_fields(bytes(cell_bytes))
+    if fields is None:
         return None
-    
+    kind, send_fields, recv_fields = fields
+    if kind == PrimKind.STOP:
+        return PrimOp(kind=PrimKind.STOP, stop=STOP_SINGLETON)
+
+    send_prim = None
+    recv_prim = None
+    if send_fields is not None:
+        deps, cell_or_neuron, message_num, send_addr, para_addr = send_fields
+        send_prim = SendPrim(deps=deps, cell_or_neuron=cell_or_neuron, message_num=message_num,
+                             send_addr=send_addr, para_addr=para_addr)
+    if recv_fields is not None:
+        deps, recv_addr, tag_id, end_num, relay_mode, mc_y, mc_x = recv_fields
+        recv_prim = RecvPrim(deps=deps, recv_addr=recv_addr, tag_id=tag_id, end_num=end_num,
+                             relay_mode=relay_mode, mc_y=mc_y, mc_x=mc_x)
+    return PrimOp(kind=kind, send=send_prim, recv=recv_prim)
+
+
+@lru_cache(maxsize=4096)
+def _decode_prim_fields(cell_bytes: bytes) -> Optional[tuple]:
+    # Decoding is pure, so identical cells share the decoded field values. Only immutable
+    # tuples are cached; decode_prim_cell builds fresh prim objects from them.
+    (para_addr, end_num, tag_id, mc_x, mc_y, msg_minus1,
+     mode, send_addr, recv_addr, deps, flags) = _PRIM_CELL.unpack(cell_bytes)
+
     # STOP special-case: bit[8:0] == 0x3
-    if int(pic[8:0]) == PRIM_KIND_STOP:
-        return PrimOp(kind="stop", stop=StopPrim())
+    if flags == PRIM_KIND_STOP:
+        return PrimKind.STOP, None, None
 
     # 检查标志位
-    send_valid = bool(pic[4])
-    recv_valid = bool(pic[5])
+    send_valid = bool(flags & _SEND_VALID)
+    recv_valid = bool(flags & _RECV_VALID)
 
     if not send_valid and not recv_valid:
         # Unknown/incomplete -> treat as terminator
         return None
 
-    send_prim = None
-    recv_prim = None
-    
-    if send_valid:
-        deps = int(pic[16:8])
-        send_addr = int(pic[64:48])
-        cell_or_neuron = int(pic[168])
-        # Decode minus-one storage back to actual N
-        message_num = int(pic[184:176]) + 1
-        para_addr = int(pic[256:240])
-        send_prim = SendPrim(
-            deps = deps,
-            cell_or_neuron=cell_or_neuron, 
-            message_num=message_num, 
-            send_addr=send_addr, 
-            para_addr=para_addr
-        )
-    
-    if recv_valid:
-        deps = int(pic[16:8])
-        recv_addr = int(pic[48:32])
-        CXY = int(pic[174:172])
-        mc_x = int(pic[198:192])
-        mc_y = int(pic[190:184])
-        tag_id = int(pic[208:200])
-        end_num = int(pic[216:208])
-        recv_prim = RecvPrim(
-            deps = deps,
-            recv_addr=recv_addr,
-            tag_id=tag_id,
-            end_num=end_num,
-            relay_mode=CXY,
-            mc_y=mc_y,
-            mc_x=mc_x,
-        )
-
-    kind = "send" if send_valid else "recv"
-    return PrimOp(kind=kind, send=send_prim, recv=recv_prim)
+    # Decode minus-one storage back to actual N
+    send_fields = (deps, mode & 0x1, msg_minus1 + 1, send_addr, para_addr) if send_valid else None
+    recv_fields = (deps, recv_addr, tag_id, end_num, (mode >> 4) & 0x3, mc_y & 0x3F, mc_x & 0x3F) if recv_valid else None
+    kind = PrimKind.SEND if send_valid else PrimKind.RECV
+    return kind, send_fields, recv_fields
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class CoreConfig:
     """Configuration bundle for one core in the array."""
 
     init_mem_path: Optional[str] = None
-    prim_queue: List[PrimOp] = None
+    # Any sequence; the config loader hands over an immutable tuple
+    prim_queue: Sequence[PrimOp] = None
     # Back-compat (optional): if present, the runner may fold them into prim_queue
     send_queue: Optional[List[SendPrim]] = None
     recv_queue: Optional[List[RecvPrim]] = None
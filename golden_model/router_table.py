@@ -1,20 +1,55 @@
 from __future__ import annotations
 
+import struct
 from dataclasses import dataclass
-from typing import List, Tuple, Dict
-
-from .memory import CoreMemory
-
-
-def _sign_extend(value: int, bits: int) -> int:
-    sign_bit = 1 << (bits - 1)
-    mask = (1 << bits) - 1
-    value &= mask
-    return (value ^ sign_bit) - sign_bit
-
-
-@dataclass
-class RouterTableEntry:
+from itertools import accumulate
+from typing import List, NamedTuple, Tuple, Dict
+
+from .memory import CoreMemory, MEM_CELL_BYTES
+
+# One 128b packet stored big-endian, split so every field lands in a small int:
+# (bits[80:72], bits[72:64], bits[64:32], bits[32:0])
+_PACKET128_WORDS = struct.Struct(">6xBBII")
+# Same packet as two big-endian qwords (bits[128:64], bits[64:0]), used when writing tables
+_PACKET128_QWORDS = struct.Struct(">QQ")
+# One 256b cell as four big-endian qwords
+_CELL_QWORDS = struct.Struct(">QQQQ")
+
+
+# Signed field widths (y/x: 6b, a_offset: 12b). Encode masks with MASK; decode sign-extends inline as
+# ((v & MASK) ^ SIGN) - SIGN
+_SIGN6, _MASK6 = 1 << 5, 0x3F
+_SIGN12, _MASK12 = 1 << 11, 0xFFF
+
+
+def _unpack_words(b9: int, b8: int, w1: int, w0: int) -> Tuple:
+    """Decode one packet from its (bits[80:72], bits[72:64], bits[64:32], bits[32:0]) words, in RouterTableEntry field order."""
+    return (
+        w0 & 0x1,                                   # s
+        (w0 >> 1) & 0x1,                            # t
+        (w0 >> 2) & 0x1,                            # e
+        (w0 >> 3) & 0x1,                            # q
+        ((w0 >> 6) & _MASK6 ^ _SIGN6) - _SIGN6,     # y
+        ((w0 >> 12) & _MASK6 ^ _SIGN6) - _SIGN6,    # x
+        (w0 >> 18) & 0x3FFF,                        # a0
+        (w1 & 0xFFF) + 1,                           # cnt is stored as N-1 (12b unsigned); decode to actual N
+        ((w1 >> 12) & _MASK12 ^ _SIGN12) - _SIGN12, # a_offset
+        (w1 >> 24) & 0x7F,                          # const_raw
+        ((w1 >> 31) & 0x1) == 1,                    # handshake
+        b8,                                         # tag_id
+        (b9 & 0x1) == 1,                            # en
+    )
+
+
+def _pack_words(s: int, t: int, e: int, q: int, y: int, x: int, a0: int, cnt: int, a_offset: int, const_raw: int, handshake: bool, tag_id: int, en: bool) -> Tuple[int, int, int, int]:
+    """Inverse of _unpack_words: encode raw field values (cnt already N-1) into (b9, b8, w1, w0)."""
+    w0 = (s & 0x1) | ((t & 0x1) << 1) | ((e & 0x1) << 2) | ((q & 0x1) << 3) \
+        | ((y & _MASK6) << 6) | ((x & _MASK6) << 12) | ((a0 & 0x3FFF) << 18)
+    w1 = (cnt & 0xFFF) | ((a_offset & _MASK12) << 12) | ((const_raw & 0x7F) << 24) | ((1 if handshake else 0) << 31)
+    return (1 if en else 0), tag_id & 0xFF, w1, w0
+
+
+class RouterTableEntry(NamedTuple):
     """
     128-bit per-message entry as constructed in SV tb `genRouterTable`.
 
@@ -54,26 +89,11 @@ class RouterTableEntry:
 
     @staticmethod
     def from_packet128(packet: int) -> "RouterTableEntry":
-        # Extract bits by mask/shift according to mapping above
-        s = (packet >> 0) & 0x1
-        t = (packet >> 1) & 0x1
-        e = (packet >> 2) & 0x1
-        q = (packet >> 3) & 0x1
-        y = _sign_extend((packet >> 6) & 0x3F, 6)
-        x = _sign_extend((packet >> 12) & 0x3F, 6)
-        a0 = (packet >> 18) & 0x3FFF
-        # cnt is stored as N-1 (12b unsigned); decode to actual N
-        cnt = ((packet >> 32) & 0xFFF) + 1
-        a_offset = _sign_extend((packet >> 44) & 0xFFF, 12)
-        const_raw = (packet >> 56) & 0x7F
-        handshake = ((packet >> 63) & 0x1) == 1
-        tag_id = (packet >> 64) & 0xFF
-        en = ((packet >> 72) & 0x1) == 1
-        return RouterTableEntry(
-            s=s, t=t, e=e, q=q, y=y, x=x, a0=a0, cnt=cnt,
-            a_offset=a_offset, const_raw=const_raw,
-            handshake=handshake, tag_id=tag_id, en=en,
-        )
+        # Split into small words first so every shift/mask below stays on machine-size ints
+        return RouterTableEntry(*_unpack_words(
+            (packet >> 72) & 0xFF, (packet >> 64) & 0xFF,
+            (packet >> 32) & 0xFFFFFFFF, packet & 0xFFFFFFFF,
+        ))
 
     def __repr__(self) -> str:  # pragma: no cover - debugging aid
         return (
@@ -82,6 +102,76 @@ class RouterTableEntry:
         )
 
 
+@dataclass
+class RouterTable:
+    """
+    Column-wise (SoA) router table: one list per RouterTableEntry field, indexed
+    by message, decoded straight from memory without per-entry objects.
+    """
+
+    s: List[int]
+    t: List[int]
+    e: List[int]
+    q: List[int]
+    y: List[int]
+    x: List[int]
+    a0: List[int]
+    cnt: List[int]
+    a_offset: List[int]
+    const_raw: List[int]
+    handshake: List[bool]
+    tag_id: List[int]
+    en: List[bool]
+    # derived: const_raw + 1
+    group_size: List[int]
+    # derived: sum of cnt over all previous messages, i.e. where each message starts in the send stream
+    prev_cnt: List[int]
+
+    @staticmethod
+    def from_memory(mem: CoreMemory, base_addr: int, message_num: int) -> "RouterTable":
+        """
+        Parse `message_num` entries starting from `base_addr` in 32B cells.
+        Each cell stores 2 entries (lower then upper). Extra entries are ignored.
+        """
+        needed_cells = (message_num + 1) // 2
+        # Pull the whole table in one read and split every 128b half into field words in one pass.
+        # Within a big-endian cell the upper packet comes first, so entry i is half i^1.
+        block = mem.read_bytes_linear(base_addr, 0, needed_cells * MEM_CELL_BYTES)
+        halves = list(_PACKET128_WORDS.iter_unpack(block))
+        words = [halves[i ^ 1] for i in range(message_num)]
+        w0 = [w[3] for w in words]  # bits[32:0]
+        w1 = [w[2] for w in words]  # bits[64:32]
+        cnt = [(v & 0xFFF) + 1 for v in w1]
+        const_raw = [(v >> 24) & 0x7F for v in w1]
+        return RouterTable(
+            s=[v & 0x1 for v in w0],
+            t=[(v >> 1) & 0x1 for v in w0],
+            e=[(v >> 2) & 0x1 for v in w0],
+            q=[(v >> 3) & 0x1 for v in w0],
+            y=[((v >> 6) & _MASK6 ^ _SIGN6) - _SIGN6 for v in w0],
+            x=[((v >> 12) & _MASK6 ^ _SIGN6) - _SIGN6 for v in w0],
+            a0=[(v >> 18) & 0x3FFF for v in w0],
+            cnt=cnt,
+            a_offset=[((v >> 12) & _MASK12 ^ _SIGN12) - _SIGN12 for v in w1],
+            const_raw=const_raw,
+            handshake=[((v >> 31) & 0x1) == 1 for v in w1],
+            tag_id=[w[1] for w in words],
+            en=[(w[0] & 0x1) == 1 for w in words],
+            group_size=[c + 1 for c in const_raw],
+            prev_cnt=list(accumulate(cnt[:-1], initial=0)) if cnt else [],
+        )
+
+    def __len__(self) -> int:
+        return len(self.cnt)
+
+    def __getitem__(self, i: int) -> RouterTableEntry:
+        return RouterTableEntry(
+            s=self.s[i], t=self.t[i], e=self.e[i], q=self.q[i], y=self.y[i], x=self.x[i],
+            a0=self.a0[i], cnt=self.cnt[i], a_offset=self.a_offset[i], const_raw=self.const_raw[i],
+            handshake=self.handshake[i], tag_id=self.tag_id[i], en=self.en[i],
+        )
+
+
 def decode_two_packets_from_cell(cell_bytes: bytes) -> Tuple[int, int]:
     """
     In tb, a 256b entry packs two 128b packets: lower 128b then upper 128b.
@@ -90,11 +180,9 @@ def decode_two_packets_from_cell(cell_bytes: bytes) -> Tuple[int, int]:
     """
     if len(cell_bytes) != 32:
         raise ValueError("cell_bytes must be 32 bytes")
-    # Interpret as big-endian integer to match hex string semantics
-    word256 = int.from_bytes(cell_bytes, byteorder="big", signed=False)
-    lower128 = word256 & ((1 << 128) - 1)
-    upper128 = (word256 >> 128) & ((1 << 128) - 1)
-    return lower128, upper128
+    # Big-endian to match hex string semantics: qwords come out most-significant first
+    q3, q2, q1, q0 = _CELL_QWORDS.unpack(cell_bytes)
+    return (q1 << 64) | q0, (q3 << 64) | q2
 
 
 def parse_router_table_from_memory(mem: CoreMemory, base_addr: int, message_num: int) -> List[RouterTableEntry]:
@@ -102,59 +190,61 @@ def parse_router_table_from_memory(mem: CoreMemory, base_addr: int, message_num:
     Parse `message_num` entries starting from `base_addr` in 32B cells.
     Each cell stores 2 entries (lower then upper). Extra entries are ignored.
     """
-    entries: List[RouterTableEntry] = []
-    needed_cells = (message_num + 1) // 2
-    for i in range(needed_cells):
-        cell = mem.read_cell(base_addr + i)
-        low, up = decode_two_packets_from_cell(cell)
-        entries.append(RouterTableEntry.from_packet128(low))
-        if len(entries) < message_num:
-            entries.append(RouterTableEntry.from_packet128(up))
-    # Trim in case of odd count
-    return entries[:message_num]
+    table = RouterTable.from_memory(mem, base_addr, message_num)
+    return [table[i] for i in range(len(table))]
+
+
+class RTEFields(NamedTuple):
+    """Router-table entry fields as given by configs (cnt is the actual N, not N-1)."""
+    s: int = 0
+    t: int = 0
+    e: int = 0
+    q: int = 0
+    y: int = 0
+    x: int = 0
+    a0: int = 0
+    cnt: int = 1
+    a_offset: int = 0
+    const_raw: int = 0
+    handshake: bool = False
+    tag_id: int = 0
+    en: bool = True
+
+
+_RTE_DEFAULTS = tuple(RTEFields._field_defaults.items())
+
+
+def encode_packet(f: RTEFields) -> int:
+    """
+    Build 128-bit packet from RTEFields.
+    Signed fields (y:6, x:6, a_offset:12) are encoded in two's complement within their bit width.
+    """
+    # cnt is stored as N-1; accept cnt>=1 externally, clamp to [1..4096]
+    cnt_actual = max(1, int(f.cnt))
+    b9, b8, w1, w0 = _pack_words(
+        f.s, f.t, f.e, f.q, f.y, f.x, f.a0, cnt_actual - 1,
+        f.a_offset, f.const_raw, f.handshake, f.tag_id, f.en,
+    )
+    return (b9 << 72) | (b8 << 64) | (w1 << 32) | w0
 
 
 def encode_packet_from_fields(fields: Dict) -> int:
     """
     Build 128-bit packet from dict fields matching RouterTableEntry semantic names:
     { s,t,e,q,y,x,a0,cnt,a_offset,const_raw,handshake,tag_id,en }
-    Signed fields (y:6, x:6, a_offset:12) are encoded in two's complement within their bit width.
+    Missing keys take the RTEFields defaults; see encode_packet.
     """
-    def to_twos(v: int, bits: int) -> int:
-        mask = (1 << bits) - 1
-        return v & mask
-
-    pkt = 0
-    pkt |= (fields.get("s", 0) & 0x1) << 0
-    pkt |= (fields.get("t", 0) & 0x1) << 1
-    pkt |= (fields.get("e", 0) & 0x1) << 2
-    pkt |= (fields.get("q", 0) & 0x1) << 3
-    pkt |= to_twos(fields.get("y", 0), 6) << 6
-    pkt |= to_twos(fields.get("x", 0), 6) << 12
-    pkt |= (fields.get("a0", 0) & 0x3FFF) << 18
-    # cnt is stored as N-1; accept cnt>=1 externally, clamp to [1..4096]
-    cnt_actual = max(1, int(fields.get("cnt", 1)))
-    pkt |= ((cnt_actual - 1) & 0xFFF) << 32
-    pkt |= to_twos(fields.get("a_offset", 0), 12) << 44
-    pkt |= (fields.get("const_raw", 0) & 0x7F) << 56
-    pkt |= (1 if fields.get("handshake", False) else 0) << 63
-    pkt |= (fields.get("tag_id", 0) & 0xFF) << 64
-    pkt |= (1 if fields.get("en", 1) else 0) << 72
-    return pkt & ((1 << 128) - 1)
+    return encode_packet(RTEFields._make([fields.get(k, d) for k, d in _RTE_DEFAULTS]))
 
 
 def write_router_table_to_memory(mem: CoreMemory, base_addr: int, packets: List[int]) -> None:
     """Write list of 128-bit packets into memory two per 32B cell (low then high)."""
-    i = 0
-    cell_idx = 0
-    while i < len(packets):
-        low = packets[i]
-        up = packets[i + 1] if (i + 1) < len(packets) else 0
-        word256 = (up << 128) | low
-        mem._cells[base_addr + cell_idx] = bytearray(word256.to_bytes(32, byteorder="big"))
-        i += 2
-        cell_idx += 1
-
-
-
-
+    if not packets:
+        return
+    # Pack every packet in place into one zeroed block (a missing upper packet stays 0), then write it in one go.
+    # A big-endian cell holds the upper packet first, so packet i lands in half slot i^1.
+    blob = bytearray(((len(packets) + 1) // 2) * MEM_CELL_BYTES)
+    pack_into = _PACKET128_QWORDS.pack_into
+    for i, p in enumerate(packets):
+        pack_into(blob, (i ^ 1) << 4, p >> 64, p & 0xFFFFFFFFFFFFFFFF)
+    mem.write_bytes_linear(base_addr, 0, blob)
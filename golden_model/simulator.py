@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Tuple
+from typing import Dict, Optional, Sequence, Tuple, Union
 
 from .core import NoCSimulator
 from .prims import CoreConfig
@@ -11,7 +11,8 @@ from .prims import CoreConfig
 class ArrayConfig:
     height: int
     width: int
-    cores: Dict[Tuple[int, int], CoreConfig]
+    # {(y, x): CoreConfig} or dense row-major list indexed y * width + x
+    cores: Union[Dict[Tuple[int, int], CoreConfig], Sequence[Optional[CoreConfig]]]
 
 
 def run_simulation(cfg: ArrayConfig) -> NoCSimulator:
@@ -0,0 +1,52 @@
+import json
+import os
+import tempfile
+import unittest
+
+from golden_model.config import load_array_config
+
+
+def _write_config(cfg: dict) -> str:
+    fd, path = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        json.dump(cfg, f)
+    return path
+
+
+class LoadArrayConfigTest(unittest.TestCase):
+    def _load(self, cfg: dict):
+        path = _write_config(cfg)
+        self.addCleanup(os.remove, path)
+        return load_array_config(path)
+
+    def test_dense_row_major_layout(self) -> None:
+        h, w, cores = self._load({"height": 2, "width": 3, "cores": [
+            {"y": 1, "x": 2, "config": {"prim_queue": [{"kind": "stop"}]}},
+        ]})
+        self.assertEqual((h, w, len(cores)), (2, 3, 6))
+        self.assertIsNotNone(cores[1 * 3 + 2])
+        self.assertEqual([c for i, c in enumerate(cores) if i != 5], [None] * 5)
+
+    def test_core_outside_grid_is_dropped(self) -> None:
+        # e.g. (0, 3) would alias (1, 0) if it were stored at y * w + x
+        for y, x in ((2, 0), (0, 3), (-1, 0)):
+            with self.subTest(y=y, x=x):
+                h, w, cores = self._load({"height": 2, "width": 3, "cores": [
+                    {"y": y, "x": x, "config": {"prim_queue": [{"kind": "stop"}]}},
+                ]})
+                self.assertEqual(cores, (None,) * 6)
+
+    def test_each_call_returns_fresh_configs(self) -> None:
+        path = _write_config({"height": 1, "width": 1, "cores": [
+            {"y": 0, "x": 0, "config": {"prim_queue": [{"kind": "recv", "recv": {"recv_addr": 8, "tag_id": 1}}]}},
+        ]})
+        self.addCleanup(os.remove, path)
+        _, _, first = load_array_config(path)
+        first[0].prim_queue[0].recv.recv_addr = 99
+        _, _, second = load_array_config(path)
+        self.assertIsNot(second[0], first[0])
+        self.assertEqual(second[0].prim_queue[0].recv.recv_addr, 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+import copy
+import pickle
+import unittest
+
+from golden_model.memory import CoreMemory
+
+
+class CoreMemoryCopyTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.mem = CoreMemory(num_cells=16)
+        self.mem.write_bytes_linear(3, 5, bytes(range(1, 41)))
+
+    def _check_independent_copy(self, other: CoreMemory) -> None:
+        self.assertEqual(other.read_bytes_linear(0, 0, 16 * 32), self.mem.read_bytes_linear(0, 0, 16 * 32))
+        self.assertEqual(other._version, self.mem._version)
+        # views are rebuilt over the copy's own buffer
+        other.write_1B(3, 5, 0xAA)
+        self.assertEqual(bytes(other.read_cell(3))[5], 0xAA)
+        self.assertEqual(bytes(self.mem.read_cell(3))[5], 1)
+
+    def test_deepcopy(self) -> None:
+        self._check_independent_copy(copy.deepcopy(self.mem))
+
+    def test_pickle_roundtrip(self) -> None:
+        self._check_independent_copy(pickle.loads(pickle.dumps(self.mem)))
+
+
+if __name__ == "__main__":
+    unittest.main()
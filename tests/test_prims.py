@@ -0,0 +1,22 @@
+import unittest
+
+from golden_model.prims import PrimOp, RecvPrim, SendPrim, decode_prim_cell, encode_prim_cell
+
+
+class DecodePrimCellTest(unittest.TestCase):
+    def test_identical_cells_decode_to_independent_objects(self) -> None:
+        cell = encode_prim_cell(PrimOp(kind="send", send=SendPrim(cell_or_neuron=1, message_num=3, send_addr=64, para_addr=96),
+                                       recv=RecvPrim(recv_addr=128, tag_id=5)))
+        first = decode_prim_cell(cell)
+        second = decode_prim_cell(bytearray(cell))
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertIsNot(first.send, second.send)
+        first.send.send_addr = 7
+        first.recv.tag_id = 9
+        self.assertEqual((second.send.send_addr, second.recv.tag_id), (64, 5))
+        self.assertEqual(decode_prim_cell(cell).send.send_addr, 64)
+
+
+if __name__ == "__main__":
+    unittest.main()
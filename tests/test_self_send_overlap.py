@@ -0,0 +1,98 @@
+"""
+Self-sends (src core == dst core) whose destination overlaps the source region:
+every unit (1B neuron / 32B cell) is read only after the earlier units have been
+written, exactly like a unit-by-unit copy.
+"""
+
+import unittest
+
+from golden_model.core import NoCSimulator
+from golden_model.prims import CoreConfig, PrimOp, RecvPrim, SendPrim
+
+TAG = 3
+PARA_ADDR = 600
+
+
+def _run_self_send(cell_or_neuron: int, send_addr: int, recv_addr: int, message: dict, init: bytes) -> bytes:
+    """Run one self-send on a 1x1 array with `init` placed at send_addr; return memory from cell 90 on."""
+    cfg = CoreConfig(prim_queue=[
+        PrimOp(kind="send", send=SendPrim(cell_or_neuron=cell_or_neuron, send_addr=send_addr, para_addr=PARA_ADDR,
+                                          messages=[dict(message, y=0, x=0, tag_id=TAG)])),
+        PrimOp(kind="recv", recv=RecvPrim(recv_addr=recv_addr, tag_id=TAG)),
+    ])
+    sim = NoCSimulator((1, 1), {(0, 0): cfg})
+    mem = sim.cores[(0, 0)].mem
+    mem.write_bytes_linear(send_addr, 0, init)
+    sim.run()
+    return mem.read_bytes_linear(90, 0, 40 * 32)
+
+
+def _stream_copy(before: bytes, src: int, dst_offsets, unit: int) -> bytes:
+    """Reference: copy unit by unit from byte offset src to each dst offset, reading after every write."""
+    buf = bytearray(before)
+    for i, d in enumerate(dst_offsets):
+        s = src + i * unit
+        buf[d : d + unit] = bytes(buf[s : s + unit])
+    return bytes(buf)
+
+
+class SelfSendNeuronOverlapTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.init = bytes(range(1, 129))  # cells 100..103
+        # Memory image before the send, relative to cell 90
+        self.before = bytes(10 * 32) + self.init + bytes(26 * 32)
+
+    def test_destination_one_byte_ahead_propagates_first_byte(self) -> None:
+        out = _run_self_send(1, 100, 100, {"a0": 1, "cnt": 8, "a_offset": 1}, self.init)
+        # Each byte is read after the previous one landed on it
+        self.assertEqual(out[320:329], bytes([1] * 9))
+        self.assertEqual(out[329:], self.before[329:])
+
+    def test_grouped_runs_match_streaming_copy(self) -> None:
+        # group of 4 bytes, runs 6 bytes apart, overlapping the source
+        msg = {"a0": 3, "cnt": 40, "a_offset": 3, "const_raw": 3}
+        out = _run_self_send(1, 100, 100, msg, self.init)
+        dst = [320 + 3 + (i // 4) * 6 + i % 4 for i in range(40)]
+        self.assertEqual(out, _stream_copy(self.before, 320, dst, 1))
+
+    def test_destination_behind_source(self) -> None:
+        out = _run_self_send(1, 101, 100, {"a0": 8, "cnt": 64, "a_offset": 1}, self.init[32:])
+        before = bytes(10 * 32) + bytes(32) + self.init[32:] + bytes(26 * 32)
+        self.assertEqual(out, _stream_copy(before, 352, [328 + i for i in range(64)], 1))
+
+    def test_disjoint_self_send(self) -> None:
+        out = _run_self_send(1, 100, 110, {"a0": 0, "cnt": 16, "a_offset": 1}, self.init)
+        self.assertEqual(out[640:656], self.init[:16])
+        self.assertEqual(out[320:448], self.init)
+
+
+class SelfSendCellOverlapTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.init = bytes((i * 7 + 1) & 0xFF for i in range(4 * 32))  # cells 100..103
+        self.before = bytes(10 * 32) + self.init + bytes(26 * 32)
+
+    def test_destination_one_cell_ahead_propagates_first_cell(self) -> None:
+        out = _run_self_send(0, 100, 100, {"a0": 4, "cnt": 3, "a_offset": 1}, self.init)
+        # Each cell is read after the previous one landed on it
+        self.assertEqual(out[320:448], self.init[:32] * 4)
+
+    def test_destination_one_segment_ahead(self) -> None:
+        # A=1: destination is 8B ahead, i.e. inside the cell being read next
+        out = _run_self_send(0, 100, 100, {"a0": 1, "cnt": 3, "a_offset": 1}, self.init)
+        self.assertEqual(out, _stream_copy(self.before, 320, [328 + 32 * i for i in range(3)], 32))
+
+    def test_grouped_runs_match_streaming_copy(self) -> None:
+        # groups of 2 cells, next group 3 segments past the end of the previous one
+        msg = {"a0": 6, "cnt": 4, "a_offset": 4, "const_raw": 1}
+        out = _run_self_send(0, 100, 100, msg, self.init)
+        dst = [320 + 48 + (i // 2) * 88 + (i % 2) * 32 for i in range(4)]
+        self.assertEqual(out, _stream_copy(self.before, 320, dst, 32))
+
+    def test_disjoint_self_send(self) -> None:
+        out = _run_self_send(0, 100, 110, {"a0": 0, "cnt": 4, "a_offset": 1}, self.init)
+        self.assertEqual(out[640:768], self.init)
+        self.assertEqual(out[320:448], self.init)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,9 +7,22 @@
   python3 view_mem.py out_mem/core_0_0.txt 0-5  # 查看地址范围
 """
 
+import mmap
 import sys
 import re
 
+_LINE_RE = re.compile(rb'@([0-9a-fA-F]+)\s+([0-9a-fA-F]+)')
+_HEX_DIGITS = b"0123456789abcdefABCDEF"
+
+def _split_line(line):
+    """拆出 (地址hex, 值hex)；dump 的固定格式 "@xxxx <hex>" 直接切分，其它情况回退到正则"""
+    head, _, value = line.partition(b" ")
+    if head[:1] == b"@" and len(head) > 1 and value \
+            and not head[1:].translate(None, _HEX_DIGITS) and not value.translate(None, _HEX_DIGITS):
+        return head[1:], value
+    match = _LINE_RE.match(line)
+    return (match.group(1), match.group(2)) if match else None
+
 def parse_addr(addr_str):
     """解析地址字符串，支持十进制、十六进制和范围"""
     if '-' in addr_str:
@@ -22,27 +35,62 @@ def parse_addr(addr_str):
         # 单个地址
         return [int(addr_str, 0)]
 
+class _LineIndex:
+    """按需记录行首偏移：只扫描到需要的那一行，不把整个文件读成 str 列表"""
+
+    def __init__(self, mm):
+        self.mm = mm
+        self.starts = [0] if len(mm) else []
+        self.done = not len(mm)
+
+    def _extend_to(self, idx):
+        mm, starts = self.mm, self.starts
+        while not self.done and len(starts) <= idx:
+            nl = mm.find(b"\n", starts[-1])
+            if nl < 0 or nl + 1 >= len(mm):
+                self.done = True
+            else:
+                starts.append(nl + 1)
+
+    def line(self, idx):
+        """第 idx 行的字节内容（不含换行），超出范围返回 None"""
+        self._extend_to(idx + 1)
+        if idx >= len(self.starts):
+            return None
+        end = self.starts[idx + 1] if idx + 1 < len(self.starts) else len(self.mm)
+        return self.mm[self.starts[idx]:end]
+
+    def count(self):
+        self._extend_to(sys.maxsize)
+        return len(self.starts)
+
 def view_memory(filepath, addresses):
     """查看内存文件中指定地址的值"""
-    with open(filepath, 'r') as f:
-        lines = f.readlines()
-    
-    print(f"{'地址':<8} {'十六进制值':<66} {'十进制值':<20}")
-    print("-" * 95)
-    
-    for addr in addresses:
-        if addr < len(lines):
-            line = lines[addr].strip()
-            match = re.match(r'@([0-9a-fA-F]+)\s+([0-9a-fA-F]+)', line)
-            if match:
-                addr_hex = match.group(1)
-                value_hex = match.group(2)
-                value_dec = int(value_hex, 16)
-                print(f"@{addr_hex:<6} {value_hex:<64} {value_dec}")
+    with open(filepath, 'rb') as f:
+        # mmap 不能映射空文件
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if f.seek(0, 2) else b""
+    try:
+        lines = _LineIndex(mm)
+
+        print(f"{'地址':<8} {'十六进制值':<66} {'十进制值':<20}")
+        print("-" * 95)
+
+        for addr in addresses:
+            raw = lines.line(addr) if addr >= 0 else None
+            if raw is not None:
+                parts = _split_line(raw.strip())
+                if parts:
+                    addr_hex = parts[0].decode()
+                    value_hex = parts[1].decode()
+                    value_dec = int(value_hex, 16)
+                    print(f"@{addr_hex:<6} {value_hex:<64} {value_dec}")
+                else:
+                    print(f"地址 {addr}: 格式错误")
             else:
-                print(f"地址 {addr}: 格式错误")
-        else:
-            print(f"地址 {addr}: 超出范围（文件只有 {len(lines)} 行）")
+                print(f"地址 {addr}: 超出范围（文件只有 {lines.count()} 行）")
+    finally:
+        if isinstance(mm, mmap.mmap):
+            mm.close()
 
 if __name__ == "__main__":
     if len(sys.argv) < 3: